@@ -10,20 +10,26 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import http.client
 import os
-import socket
+import ssl
 import time
+from collections.abc import Iterable
 from typing import Optional
 
-import requests
+from azure.core.exceptions import AzureError
 from azure.cosmos import CosmosClient
 
 from testcontainers.core.generic import DbContainer
 from testcontainers.core.utils import setup_logger
-from testcontainers.core.waiting_utils import wait_for_logs
 
 logger = setup_logger(__name__)
 
+# The emulator only serves a self-signed certificate, so requests to it are never verified
+_UNVERIFIED_CONTEXT = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_UNVERIFIED_CONTEXT.check_hostname = False
+_UNVERIFIED_CONTEXT.verify_mode = ssl.CERT_NONE
+
 
 class CosmosDbContainer(DbContainer):
     """
@@ -34,6 +40,12 @@ class CosmosDbContainer(DbContainer):
     Notably, you cannot change the default account endpoint and account key.
     Currently, SSL verification is not supported.
 
+    To keep start-up fast, the emulator is started with a single partition. Pass :code:`partition_count`
+    or set :code:`AZURE_COSMOS_EMULATOR_PARTITION_COUNT` if your tests need more containers.
+
+    :code:`get_connection_client()` returns a new client owned by the caller, while :code:`client` is a
+    single client shared until the container is stopped, which must not be closed by the caller.
+
     Example:
 
         The example will spin up a CosmosDb emulator, connect to it,
@@ -42,8 +54,7 @@ class CosmosDbContainer(DbContainer):
         .. doctest::
 
             >>> from azure.cosmos import PartitionKey
-            >>> import urllib3
-            >>> from testcontainers.cosmosdb import CosmosDbContainer
+            >>>             >>> from testcontainers.cosmosdb import CosmosDbContainer
             >>> urllib3.disable_warnings()
             >>> with CosmosDbContainer() as cosmosdb:
             ...     client = cosmosdb.get_connection_client()
@@ -61,79 +72,147 @@ class CosmosDbContainer(DbContainer):
     """
 
     localhost = "localhost"
-    ip_address = socket.gethostbyname(localhost)
+    ip_address = "127.0.0.1"
     port = 8081
-    timeout = 120.0
+    # The emulator is slow to start, especially on loaded CI machines
+    timeout = 300.0
+    # This is a static key
+    account_key = "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw=="
 
     def __init__(
         self,
         image: str = "mcr.microsoft.com/cosmosdb/linux/azure-cosmos-emulator:latest",
         partition_count: Optional[str] = None,
         ip_address_override: Optional[str] = None,
+        port: int = 8081,
+        bind_ports: Iterable[int] = range(10250, 10256),
+        start_timeout: Optional[float] = None,
         **kwargs,
     ) -> None:
-        if "port" in kwargs:
-            logger.warn(
-                "Port is specified in kwargs, but it is not supported by CosmosDb emulator. \
-                        Default port {self.PORT} will be used."
-            )
+        if port != self.port:
+            raise ValueError(f"CosmosDb emulator only supports port {self.port}, got {port}")
 
         super().__init__(image=image, **kwargs)
 
         self.partition_count = (
-            partition_count if partition_count else os.environ.get("AZURE_COSMOS_EMULATOR_PARTITION_COUNT", "")
+            partition_count if partition_count else os.environ.get("AZURE_COSMOS_EMULATOR_PARTITION_COUNT", "1")
         )
         self.ip_address = ip_address_override if ip_address_override else self.ip_address
-        self.with_bind_ports(self.port, self.port)
-        for p in range(10250, 10256):
-            self.with_bind_ports(p, p)
+        # The emulator advertises fixed ports, so each one is bound to the same port on the host.
+        # Only the gateway port is required; callers that do not need all endpoints may bind fewer.
+        self.ports.update({p: p for p in (self.port, *bind_ports)})
+        # The endpoint is fixed as well, so there is nothing to look up once the container runs
+        self._connection_url = f"https://{self.localhost}:{self.port}/"
+        self._client: Optional[CosmosClient] = None
+        self.start_timeout = start_timeout if start_timeout is not None else self.timeout
 
     def _configure(self) -> None:
         if self.partition_count:
             self.with_env("AZURE_COSMOS_EMULATOR_PARTITION_COUNT", self.partition_count)
         self.with_env("AZURE_COSMOS_EMULATOR_IP_ADDRESS_OVERRIDE", self.ip_address)
 
-    @staticmethod
-    def get_account_key() -> str:
-        # This is a static key
-        return "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw=="
+    @classmethod
+    def get_account_key(cls) -> str:
+        return cls.account_key
 
     def get_connection_url(self) -> str:
-        return f"https://{self.localhost}:{self.port}/"
+        return self._connection_url
 
     def _connect(self) -> None:
-        def check_logs(stdout: str) -> bool:
-            return stdout.splitlines()[-1].endswith("Started") if stdout else False
+        # The started marker and the endpoint are independent signals. Both are polled in the same loop on
+        # the calling thread, so waiting on many emulators at once does not tie up additional threads.
+        container = self.get_wrapped_container()
+        container.reload()
+        has_health_check = container.attrs.get("State", {}).get("Health") is not None
+
+        def check_health() -> bool:
+            # A single inspect call instead of transferring the whole log on every poll
+            container.reload()
+            return container.attrs["State"]["Health"]["Status"] == "healthy"
+
+        def check_logs() -> bool:
+            # Only a bounded tail is inspected, so the (potentially large) log is neither copied,
+            # decoded nor split into lines on every poll.
+            return any(log[-64:].rstrip().endswith(b"Started") for log in self.get_logs())
+
+        check_started = check_health if has_health_check else check_logs
+        started_signal = "healthy status" if has_health_check else "started marker in logs"
 
-        logger.info("Waiting for started marker in logs...")
-        wait_for_logs(self, check_logs, timeout=self.timeout)
+        connection_url = self.get_connection_url()
+        # A plain keep-alive connection is all the probe needs; it reconnects by itself after being closed
+        connection = http.client.HTTPSConnection(self.localhost, self.port, context=_UNVERIFIED_CONTEXT, timeout=2)
 
         def wait_for_successful_request() -> bool:
+            # HEAD keeps the probe cheap: no certificate body is transferred on each attempt
             try:
-                response = requests.get(f"{self.get_connection_url()}_explorer/emulator.pem", verify=False)
-                return response.status_code == 200
-            except requests.exceptions.RequestException:
+                connection.request("HEAD", "/_explorer/emulator.pem")
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    return False
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                return False
+            # The certificate is served before the gateway can handle data plane requests,
+            # so only consider the emulator ready once the account can actually be read.
+            # Constructing the client already reads the database account and raises if that fails.
+            try:
+                with CosmosClient(
+                    connection_url,
+                    credential=self.account_key,
+                    connection_verify=False,
+                    connection_timeout=2,
+                    retry_total=0,
+                ):
+                    return True
+            except AzureError:
                 return False
 
-        start_time = time.time()
-        logger.info("Waiting for endpoint to be available...")
-        while True:
-            duration = time.time() - start_time
-            if duration > self.timeout:
-                raise TimeoutError("Container did not start in time")
-            if wait_for_successful_request():
-                break
-            time.sleep(1)
+        start_time = time.monotonic()
+        delay = 0.1
+        started = available = False
+        logger.info("Waiting for %s and endpoint to be available...", started_signal)
+        try:
+            while True:
+                started = started or check_started()
+                available = available or wait_for_successful_request()
+                if started and available:
+                    break
+                if time.monotonic() - start_time > self.start_timeout:
+                    pending = "endpoint to be available" if started else started_signal
+                    raise TimeoutError(f"Container did not start in time, still waiting for {pending}")
+                time.sleep(delay)
+                delay = min(delay * 1.5, 2.0)
+        finally:
+            connection.close()
 
     def start(self) -> "CosmosDbContainer":
+        self._close_client()
+        # DbContainer.start already waits for the emulator via _connect
         super().start()
-        self._connect()
         return self
 
+    def stop(self, force=True, delete_volume=True) -> None:
+        self._close_client()
+        super().stop(force=force, delete_volume=delete_volume)
+
+    def _close_client(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    @property
+    def client(self) -> CosmosClient:
+        # Constructing a client reads the account metadata, so this one is shared until the container stops.
+        # It is owned by the container: use get_connection_client() for a client that may be closed.
+        if self._client is None:
+            self._client = self.get_connection_client()
+        return self._client
+
     def get_connection_client(self) -> CosmosClient:
         return CosmosClient(
             self.get_connection_url(),
-            credential=CosmosDbContainer.get_account_key(),
+            credential=self.account_key,
             connection_verify=False,
             retry_total=3,
         )
@@ -1,12 +1,36 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import docker
+import pytest
 from azure.cosmos import PartitionKey
 import urllib3
 
 from testcontainers.cosmosdb import CosmosDbContainer
 
+IMAGE = "mcr.microsoft.com/cosmosdb/linux/azure-cosmos-emulator:latest"
+
+
+def emulator_image_available() -> bool:
+    if os.environ.get("COSMOSDB_EMULATOR_TEST") == "1":
+        return True
+    try:
+        docker.from_env().images.get(IMAGE)
+    except docker.errors.DockerException:
+        return False
+    return True
+
 
+requires_emulator = pytest.mark.skipif(
+    not emulator_image_available(),
+    reason=f"{IMAGE} is not cached locally, set COSMOSDB_EMULATOR_TEST=1 to pull it",
+)
+
+
+@requires_emulator
 def test_docker_run_cosmosdb():
     urllib3.disable_warnings()
-    with CosmosDbContainer("mcr.microsoft.com/cosmosdb/linux/azure-cosmos-emulator:latest") as cosmosdb:
+    with CosmosDbContainer(IMAGE) as cosmosdb:
         client = cosmosdb.get_connection_client()
 
         database = client.create_database_if_not_exists(
@@ -35,3 +59,80 @@ def test_docker_run_cosmosdb():
         existing_item = container.read_item(item=new_item["id"], partition_key=new_item["id"])
 
         assert created_item == existing_item
+
+
+@requires_emulator
+def test_cosmosdb_shared_client():
+    urllib3.disable_warnings()
+    with CosmosDbContainer(IMAGE) as cosmosdb:
+        shared = cosmosdb.client
+        assert cosmosdb.client is shared
+
+        with cosmosdb.get_connection_client() as owned:
+            assert owned is not shared
+        # Closing a caller-owned client must leave the shared one usable
+        assert cosmosdb.client is shared
+        shared.get_database_account()
+
+        shared.close = MagicMock(wraps=shared.close)
+
+    shared.close.assert_called_once_with()
+    assert cosmosdb._client is None
+
+
+def test_cosmosdb_rejects_other_port():
+    with pytest.raises(ValueError, match="8081"):
+        CosmosDbContainer(port=1234)
+
+
+def test_cosmosdb_binds_gateway_and_requested_ports():
+    with patch("testcontainers.core.docker_client.docker", MagicMock(spec=docker)):
+        assert CosmosDbContainer(bind_ports=[]).ports == {8081: 8081}
+        assert CosmosDbContainer(bind_ports=[10251]).ports == {8081: 8081, 10251: 10251}
+        assert CosmosDbContainer().ports == {p: p for p in (8081, *range(10250, 10256))}
+
+
+def emulator_with_health(*statuses: str) -> CosmosDbContainer:
+    # The wrapped container reports the given health statuses on consecutive inspections
+    with patch("testcontainers.core.docker_client.docker", MagicMock(spec=docker)):
+        cosmosdb = CosmosDbContainer()
+    wrapped = MagicMock()
+    remaining = iter(statuses)
+
+    def reload():
+        wrapped.attrs = {"State": {"Health": {"Status": next(remaining, statuses[-1])}}}
+
+    wrapped.reload.side_effect = reload
+    cosmosdb._container = wrapped
+    return cosmosdb
+
+
+def test_cosmosdb_waits_for_healthy_status():
+    cosmosdb = emulator_with_health("starting", "starting", "starting", "healthy")
+    with (
+        patch("http.client.HTTPSConnection") as connection,
+        patch("testcontainers.cosmosdb.CosmosClient") as client,
+    ):
+        connection.return_value.getresponse.return_value.status = 200
+        cosmosdb._connect()
+
+    # The health check replaces log parsing, and the endpoint is not probed again once it was available
+    cosmosdb.get_wrapped_container().logs.assert_not_called()
+    assert cosmosdb.get_wrapped_container().reload.call_count == 4
+    connection.return_value.request.assert_called_once_with("HEAD", "/_explorer/emulator.pem")
+    client.assert_called_once()
+
+
+def test_cosmosdb_times_out_waiting_for_healthy_status():
+    cosmosdb = emulator_with_health("starting")
+    cosmosdb.start_timeout = 0.3
+    with (
+        patch("http.client.HTTPSConnection") as connection,
+        patch("testcontainers.cosmosdb.CosmosClient"),
+    ):
+        connection.return_value.getresponse.return_value.status = 200
+        with pytest.raises(TimeoutError, match="still waiting for healthy status"):
+            cosmosdb._connect()
+
+    connection.return_value.request.assert_called_once()
+    connection.return_value.close.assert_called_once_with()